@@ -4,21 +4,124 @@ MP3 Crawler and Downloader
 Searches a page and all pages one click away for MP3 files and downloads them
 """
 
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse, unquote
+import httpx
+import lxml.html
+from urllib.parse import urljoin, urldefrag, urlparse, unquote
+import json
 import os
 import re
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+import threading
 import time
 
+# Responses worth retrying after a short pause (rate limited or a temporary server error)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+STATUS_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+
+class RetryTransport(httpx.HTTPTransport):
+    """HTTPTransport that also retries RETRY_STATUSES with exponential backoff
+    
+    The built-in retries= only covers failed connections, not responses like 429 or 503.
+    """
+    
+    def handle_request(self, request):
+        for attempt in range(STATUS_RETRIES):
+            response = super().handle_request(request)
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            response.close()
+            time.sleep(BACKOFF_FACTOR * 2 ** attempt)
+        return super().handle_request(request)
+
+# One shared HTTP/2 client - on servers that support it, every request to the site is
+# multiplexed over a single connection instead of one TLS handshake per pooled connection
+SESSION = httpx.Client(
+    transport=RetryTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        retries=3,
+    ),
+    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'},
+    follow_redirects=True,
+    timeout=30.0,
+)
+
+# How many linked pages are fetched at the same time (keeps the load on the server bounded)
+PAGE_WORKERS = 10
+
+# How many MP3s are downloaded at the same time
+DOWNLOAD_WORKERS = 8
+
+# Compiled once - bytes pattern so it runs on the raw response body without decoding it
+MP3_URL_RE = re.compile(rb'(?i)https?://[^\s<>"\'\\]+?\.mp3(?:\?[^\s<>"\']*)?')
+
+# Remembers ETag/Last-Modified and scan results per page, so re-runs skip unchanged pages,
+# and the file each MP3 URL was saved as, so re-runs don't fetch files that are still there
+CACHE_FILENAME = '.mp3_crawler_cache.json'
+
+# Only links that look like pages (or .mp3 landing pages) are worth scanning - not CSS, JS,
+# images, video, archives and so on. '' covers extensionless paths like /episodes/
+PAGE_EXT = frozenset({'', '.mp3', '.html', '.htm', '.php', '.aspx'})
+SKIP_PREFIXES = ('#', 'mailto:', 'javascript:')
+
+# Used by sanitize_filename
+TRACK_NUMBER_RE = re.compile(r'^\d+[\s.-]*')
+INVALID_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+WHITESPACE_RE = re.compile(r'\s+')
+
+@lru_cache(maxsize=4096)
+def _cached_urlparse(url):
+    """urlparse is pure Python and the same URLs get parsed again and again while crawling"""
+    return urlparse(url)
+
+class HostRateLimiter:
+    """Token bucket per host - lets parallel workers share a request budget for each server"""
+    
+    def __init__(self, rate, burst):
+        self.rate = rate      # tokens added per second
+        self.burst = burst    # most tokens a host can save up
+        self.buckets = {}     # netloc -> (tokens, time of last refill)
+        self.lock = threading.Lock()
+    
+    def wait(self, url):
+        """Block until a request to this URL's host is allowed"""
+        host = _cached_urlparse(url).netloc
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                tokens, last = self.buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+                if tokens >= 1:
+                    self.buckets[host] = (tokens - 1, now)
+                    return
+                self.buckets[host] = (tokens, now)
+                delay = (1 - tokens) / self.rate
+            time.sleep(delay)
+
+# Be nice to the server: roughly 4 requests (page scans, HEAD checks and downloads) per second per host
+RATE_LIMITER = HostRateLimiter(rate=4, burst=DOWNLOAD_WORKERS)
+
+# Guards the set of taken filenames shared by the download threads
+FILENAME_LOCK = threading.Lock()
+
+# Keeps lines printed by different download threads from running into each other
+PRINT_LOCK = threading.Lock()
+
+def log(message):
+    """Print a whole line at once - safe to call from worker threads"""
+    with PRINT_LOCK:
+        print(message)
+
 def sanitize_filename(filename):
     """Clean up filename"""
     filename = unquote(filename)
     filename = os.path.basename(filename)
-    filename = re.sub(r'^\d+[\s.-]*', '', filename)
-    filename = re.sub(r'[<>:"/\\|?*]', '', filename)
-    filename = re.sub(r'\s+', ' ', filename).strip()[:200]
+    filename = TRACK_NUMBER_RE.sub('', filename)
+    filename = INVALID_CHARS_RE.sub('', filename)
+    filename = WHITESPACE_RE.sub(' ', filename).strip()[:200]
     
     if not filename or filename == '.mp3':
         filename = "audio.mp3"
@@ -27,14 +130,25 @@ def sanitize_filename(filename):
     
     return filename
 
-def is_valid_mp3_url(url, base_domain):
+def reserve_filename(filename, existing):
+    """Pick a name that isn't in the output folder yet and claim it"""
+    with FILENAME_LOCK:
+        if filename in existing:
+            base, ext = os.path.splitext(filename)
+            counter = 1
+            while f"{base}_{counter}{ext}" in existing:
+                counter += 1
+            filename = f"{base}_{counter}{ext}"
+        existing.add(filename)
+    return filename
+
+def is_valid_mp3_url(url, base_netloc):
     """Check if URL is valid and on same domain"""
     try:
-        parsed = urlparse(url)
-        base_parsed = urlparse(base_domain)
+        parsed = _cached_urlparse(url)
         
         # Must be same domain
-        if parsed.netloc != base_parsed.netloc:
+        if parsed.netloc != base_netloc:
             return False
         
         # Must end in .mp3
@@ -45,194 +159,229 @@ def is_valid_mp3_url(url, base_domain):
     except:
         return False
 
-def find_real_mp3_on_page(page_url, base_domain):
-    """Look for actual MP3 download URLs on a single page"""
-    mp3_urls = []
+def is_html(content_type, first_bytes):
+    """Check whether a response is an HTML page rather than audio"""
+    if content_type.startswith('audio/'):
+        return False
+    if 'text/html' in content_type:
+        return True
+    # Markup starts with '<' (after an optional BOM) - audio starts with ID3 tags or 0xFF frame sync bytes
+    head = first_bytes[:64]
+    if head.startswith(b'\xef\xbb\xbf'):
+        head = head[3:]
+    return head.lstrip()[:1] == b'<'
+
+def load_cache(output_dir):
+    """Load what a previous run saved: {'pages': {url: scan result}, 'downloaded': {MP3 URL: filename}}"""
+    cache = {'pages': {}, 'downloaded': {}}
+    try:
+        with open(os.path.join(output_dir, CACHE_FILENAME), encoding='utf-8') as f:
+            saved = json.load(f)
+        cache['pages'] = saved.get('pages', {})
+        downloaded = saved.get('downloaded', {})
+        cache['downloaded'] = downloaded if isinstance(downloaded, dict) else {}
+    except (OSError, ValueError, AttributeError):
+        pass
+    return cache
+
+def save_cache(output_dir, cache):
+    """Save the page cache and the downloaded files for the next run"""
+    try:
+        with open(os.path.join(output_dir, CACHE_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"    ✗ Could not save page cache: {e}")
+
+def scan_page(page_url, base_netloc, cache=None):
+    """Fetch a page once and return (set of MP3 URLs on it, set of pages linked from it on the same domain)
+    
+    Links ending in .mp3 are usually HTML pages with an audio player, so scanning them here turns them
+    into the real MP3 URL. If the page turns out to be an actual audio file, it is returned as its own MP3.
+    
+    With a cache dict (load_cache()['pages']), the request is conditional and an unchanged page (304) is
+    answered from the cache without being downloaded or parsed again.
+    """
+    mp3_urls = set()
+    linked_pages = set()
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        cached = cache.get(page_url) if cache is not None else None
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
         
-        response = requests.get(page_url, headers=headers, timeout=15)
-        response.raise_for_status()
+        RATE_LIMITER.wait(page_url)
+        with SESSION.stream('GET', page_url, headers=headers, timeout=15) as response:
+            if response.status_code == 304 and cached:
+                return set(cached['mp3s']), set(cached['links'])
+            response.raise_for_status()
+            
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            
+            # The link was a real audio file after all - don't pull it all down just to scan it
+            content_type = response.headers.get('content-type', '').lower()
+            if content_type.startswith('audio/'):
+                return {page_url}, set()
+            
+            # MP3s are often served as application/octet-stream, so sniff the first chunk too
+            chunks = response.iter_bytes()
+            first_chunk = next(chunks, b'')
+            if not is_html(content_type, first_chunk):
+                if '.mp3' in page_url.lower():
+                    return {page_url}, set()
+                # Not a page (a video, an archive, ...) - nothing to scan, so don't read the rest
+                return set(), set()
+            
+            content = first_chunk + b''.join(chunks)
+            encoding = response.charset_encoding
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Without a charset in the headers lxml falls back to Latin-1 unless the page has a <meta charset>,
+        # which garbles non-ASCII URLs - use UTF-8 whenever the bytes are valid UTF-8
+        if not encoding:
+            try:
+                content.decode('utf-8')
+                encoding = 'utf-8'
+            except UnicodeDecodeError:
+                pass
+        parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+        doc = lxml.html.fromstring(content, parser=parser)
         
         # Method 1: Check audio tags - THIS IS THE KEY METHOD
-        for audio in soup.find_all('audio'):
-            src = audio.get('src')
-            if src:
-                full_url = urljoin(page_url, src)
-                # Don't filter by domain - accept ANY mp3 URL
-                if '.mp3' in src.lower():
-                    mp3_urls.append(full_url)
-            
-            for source in audio.find_all('source'):
-                src = source.get('src')
-                if src:
-                    full_url = urljoin(page_url, src)
-                    if '.mp3' in src.lower():
-                        mp3_urls.append(full_url)
+        for src in doc.xpath('//audio/@src | //audio//source/@src'):
+            # Don't filter by domain - accept ANY mp3 URL
+            if '.mp3' in src.lower():
+                mp3_urls.add(urljoin(page_url, src))
         
-        # Method 2: Check all links
-        for a in soup.find_all('a', href=True):
-            href = a['href']
+        # Method 2: Check all links - a single pass collects both MP3s and pages one click away
+        for href in doc.xpath('//a/@href'):
+            full_url = urljoin(page_url, href)
+            
             if '.mp3' in href.lower():
-                full_url = urljoin(page_url, href)
-                mp3_urls.append(full_url)
+                mp3_urls.add(full_url)
+            
+            # Skip in-page anchors, mail/script links and anything that isn't a page
+            if href.lstrip().lower().startswith(SKIP_PREFIXES):
+                continue
+            parsed = _cached_urlparse(full_url)
+            if os.path.splitext(parsed.path)[1].lower() not in PAGE_EXT:
+                continue
+            
+            # Only include links on same domain
+            if parsed.netloc == base_netloc:
+                # Include links ending in .mp3 too (they're usually HTML pages with audio players)
+                linked_pages.add(urldefrag(full_url)[0])
         
         # Method 3: Search page source for ANY mp3 URLs (even from different domains)
-        page_source = response.text
-        mp3_pattern = r'https?://[^\s<>"\']+\.mp3(?:\?[^\s<>"\']*)?'
-        matches = re.findall(mp3_pattern, page_source, re.IGNORECASE)
+        for match in MP3_URL_RE.findall(content):
+            # The query part can swallow trailing punctuation from the surrounding text, e.g. "(url)" or "[url]"
+            mp3_urls.add(match.decode('utf-8', 'ignore').rstrip(',;)]'))
         
-        for match in matches:
-            match = match.rstrip('",;)\']')
-            mp3_urls.append(match)
+        if cache is not None and (etag or last_modified):
+            cache[page_url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'mp3s': sorted(mp3_urls),
+                'links': sorted(linked_pages),
+            }
         
-        return list(set(mp3_urls))  # Remove duplicates
+        return mp3_urls, linked_pages
         
     except Exception as e:
-        return []
+        return set(), set()
 
-def get_linked_pages(page_url, base_domain):
-    """Get all pages linked from this page (one click away)"""
-    linked_pages = []
+def preflight(mp3_url, referer=None):
+    """HEAD an MP3 URL and return (worth downloading, Content-Length or 0 if unknown)"""
+    headers = {'Referer': referer} if referer else {}
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(page_url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        base_parsed = urlparse(base_domain)
-        
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            full_url = urljoin(page_url, href)
-            parsed = urlparse(full_url)
-            
-            # Only include links on same domain
-            if parsed.netloc == base_parsed.netloc:
-                # Include ALL links - even if they end in .mp3 (they're actually HTML pages with audio players)
-                linked_pages.append(full_url)
-        
-        return list(set(linked_pages))  # Remove duplicates
-        
+        RATE_LIMITER.wait(mp3_url)
+        response = SESSION.head(mp3_url, headers=headers, timeout=10)
     except Exception as e:
-        return []
+        return True, 0  # Can't tell - let the download decide
+    
+    # Only a definite "not found" is dead - other errors (HEAD refused by a CDN, still rate limited
+    # or failing after the retries) are left for the real GET to decide
+    if response.status_code in (404, 410):
+        return False, 0
+    if response.status_code >= 400:
+        return True, 0
+    
+    content_type = response.headers.get('content-type', '').lower()
+    size = int(response.headers.get('Content-Length') or 0)
+    
+    if is_html(content_type, b''):
+        return False, size
+    if 0 < size < 1000:
+        return False, size
+    return True, size
 
-def download_mp3(mp3_url, output_dir, referer=None):
-    """Download an actual MP3 file - handles both direct MP3s and HTML pages with audio players"""
+def download_mp3(mp3_url, output_dir, referer=None, existing=None):
+    """Download a direct MP3 file (landing pages with audio players are resolved while crawling)
+    
+    existing is the set of filenames already in output_dir - pass the same set to every call
+    so duplicates are detected without touching the disk.
+    
+    Returns the filename the MP3 was saved as, or False if nothing was saved.
+    """
+    if existing is None:
+        existing = set(os.listdir(output_dir))
+    
+    # Downloads run in parallel, so every status line names its file
+    name = os.path.basename(_cached_urlparse(mp3_url).path)
+    
     try:
-        # IMPORTANT: The mp3_url might actually be an HTML page with an audio player
-        # We need to check if it's HTML and extract the real MP3 URL if needed
-        
         headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'audio/mpeg, audio/*, text/html, */*',
+            'Accept': 'audio/mpeg, audio/*, */*',
         }
         
         if referer:
             headers['Referer'] = referer
         
-        print(f"    Processing: {os.path.basename(urlparse(mp3_url).path)}")
-        
-        # First, fetch the URL to see what it is
-        response = requests.get(mp3_url, headers=headers, timeout=30, allow_redirects=True)
-        response.raise_for_status()
+        log(f"    Processing: {name}")
         
-        content_type = response.headers.get('content-type', '').lower()
-        
-        # Check if we got HTML instead of audio
-        if 'text/html' in content_type or response.content[:15].lower().startswith(b'<!doctype') or b'<html' in response.content[:100].lower():
-            print(f"      → This is an HTML page, extracting real MP3 URL...")
+        # Streamed, so only the first chunk is read before deciding whether to keep it
+        RATE_LIMITER.wait(mp3_url)
+        with SESSION.stream('GET', mp3_url, headers=headers, timeout=120) as response:
+            response.raise_for_status()
             
-            # Parse the HTML to find the audio tag
-            soup = BeautifulSoup(response.content, 'html.parser')
+            content_type = response.headers.get('content-type', '').lower()
+            chunks = response.iter_bytes(chunk_size=65536)
+            first_chunk = next(chunks, b'')
             
-            # Look for audio tag
-            audio_tag = soup.find('audio')
-            if audio_tag:
-                real_mp3_url = audio_tag.get('src')
-                if real_mp3_url:
-                    real_mp3_url = urljoin(mp3_url, real_mp3_url)
-                    print(f"      → Found real MP3: {real_mp3_url}")
-                    
-                    # Now download the REAL MP3
-                    mp3_response = requests.get(real_mp3_url, headers=headers, stream=True, timeout=120, allow_redirects=True)
-                    mp3_response.raise_for_status()
-                    
-                    filename = sanitize_filename(os.path.basename(urlparse(real_mp3_url).path))
-                    filepath = os.path.join(output_dir, filename)
-                    
-                    # Handle duplicates
-                    if os.path.exists(filepath):
-                        base, ext = os.path.splitext(filename)
-                        counter = 1
-                        while os.path.exists(filepath):
-                            filename = f"{base}_{counter}{ext}"
-                            filepath = os.path.join(output_dir, filename)
-                            counter += 1
-                    
-                    print(f"      Downloading: {filename}")
-                    
-                    # Download the actual MP3
-                    total_size = 0
-                    with open(filepath, 'wb') as f:
-                        for chunk in mp3_response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                total_size += len(chunk)
-                    
-                    if total_size < 1000:
-                        os.remove(filepath)
-                        print(f"      ✗ File too small: {total_size} bytes")
-                        return False
-                    
-                    print(f"      ✓ Downloaded! ({total_size / (1024*1024):.2f} MB)")
-                    return True
-                else:
-                    print(f"      ✗ No src attribute in audio tag")
-                    return False
-            else:
-                print(f"      ✗ No <audio> tag found in HTML")
+            # A landing page that wasn't crawled (e.g. two clicks away) - nothing to save
+            if is_html(content_type, first_chunk):
+                log(f"      ✗ {name}: not an audio file (HTML page), skipping")
                 return False
-        
-        else:
-            # It's already a direct MP3 file, save it
-            filename = sanitize_filename(os.path.basename(urlparse(mp3_url).path))
-            filepath = os.path.join(output_dir, filename)
             
             # Handle duplicates
-            if os.path.exists(filepath):
-                base, ext = os.path.splitext(filename)
-                counter = 1
-                while os.path.exists(filepath):
-                    filename = f"{base}_{counter}{ext}"
-                    filepath = os.path.join(output_dir, filename)
-                    counter += 1
-            
-            print(f"      Downloading: {filename}")
-            
-            total_size = len(response.content)
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            filename = reserve_filename(sanitize_filename(name), existing)
+            filepath = os.path.join(output_dir, filename)
             
-            if total_size < 1000:
-                os.remove(filepath)
-                print(f"      ✗ File too small: {total_size} bytes")
-                return False
+            log(f"      Downloading: {filename}")
             
-            print(f"      ✓ Downloaded! ({total_size / (1024*1024):.2f} MB)")
-            return True
+            # 1 MB write buffer, so the 64 KB chunks reach the disk in a few large writes
+            with open(filepath, 'wb', buffering=1024*1024) as f:
+                f.write(first_chunk)
+                for chunk in chunks:
+                    f.write(chunk)
+        
+        total_size = os.path.getsize(filepath)
+        
+        if total_size < 1000:
+            os.remove(filepath)
+            existing.discard(filename)
+            log(f"      ✗ {filename}: file too small ({total_size} bytes)")
+            return False
+        
+        log(f"      ✓ Downloaded {filename} ({total_size / (1024*1024):.2f} MB)")
+        return filename
         
     except Exception as e:
-        print(f"      ✗ Error: {e}")
+        log(f"      ✗ {name}: error: {e}")
         return False
 
 def main():
@@ -254,28 +403,24 @@ def main():
     print("Starting search...")
     print(f"{'='*70}\n")
     
-    base_domain = f"{urlparse(start_url).scheme}://{urlparse(start_url).netloc}"
-    all_mp3s = set()
+    base_netloc = urlparse(start_url).netloc
+    all_mp3s = {}  # MP3 URL -> page it was found on (sent as Referer)
+    scanned_pages = {start_url}
+    cache = load_cache(output)
     downloaded_count = 0
     
     # Step 1: Search the main page
     print(f"[1] Searching main page: {start_url}")
-    mp3s_on_main = find_real_mp3_on_page(start_url, base_domain)
+    mp3s_on_main, linked_pages = scan_page(start_url, base_netloc, cache['pages'])
     
     if mp3s_on_main:
         print(f"    Found {len(mp3s_on_main)} MP3(s) on main page")
-        for mp3 in mp3s_on_main:
-            if mp3 not in all_mp3s:
-                all_mp3s.add(mp3)
-                if download_mp3(mp3, output, referer=start_url):
-                    downloaded_count += 1
-                time.sleep(0.3)
+        all_mp3s.update(dict.fromkeys(mp3s_on_main, start_url))
     else:
         print(f"    No MP3s found on main page")
     
-    # Step 2: Get all linked pages
+    # Step 2: Linked pages were collected while scanning the main page
     print(f"\n[2] Finding linked pages...")
-    linked_pages = get_linked_pages(start_url, base_domain)
     print(f"    Found {len(linked_pages)} linked pages")
     
     # Step 3: Search each linked page
@@ -283,23 +428,117 @@ def main():
         print(f"\n[3] Searching linked pages for MP3s...")
         print(f"    (Note: Pages ending in .mp3 are actually HTML with audio players)")
         
-        for i, page_url in enumerate(linked_pages[:100], 1):  # Limit to first 100 pages
-            print(f"\n    [{i}/{min(len(linked_pages), 100)}] Checking: {os.path.basename(page_url)}")
+        pages_to_check = list(linked_pages)[:100]  # Limit to first 100 pages
+        scanned_pages.update(pages_to_check)
+        landing_pages = set()
+        
+        # Fetch pages concurrently, handle results as each one finishes
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+            futures = {
+                executor.submit(scan_page, page_url, base_netloc, cache['pages']): page_url
+                for page_url in pages_to_check
+            }
+            
+            for i, future in enumerate(as_completed(futures), 1):
+                page_url = futures[future]
+                print(f"\n    [{i}/{len(pages_to_check)}] Checked: {os.path.basename(page_url)}")
+                
+                mp3s_on_page, _ = future.result()  # Only go one click away
+                
+                # A landing page's real MP3 was found above, the page itself is not a download.
+                # An empty result may just be a failed fetch, so the URL stays a candidate then.
+                if mp3s_on_page and page_url not in mp3s_on_page:
+                    landing_pages.add(page_url)
+                
+                if mp3s_on_page:
+                    print(f"        ✓ Found {len(mp3s_on_page)} MP3(s)")
+                    new_mp3s = mp3s_on_page - all_mp3s.keys()
+                    all_mp3s.update(dict.fromkeys(new_mp3s, page_url))
+                else:
+                    print(f"        No MP3s found on this page")
+        
+        for page_url in landing_pages:
+            all_mp3s.pop(page_url, None)
+    
+    # MP3s saved by an earlier run don't need resolving, checking or downloading again -
+    # unless their file has been deleted from the output folder since
+    existing = set(os.listdir(output))
+    already_downloaded = {mp3 for mp3, filename in cache['downloaded'].items() if filename in existing}
+    
+    # Step 4: MP3 links that weren't crawled (past the page limit, two clicks away or on another
+    # domain) may be landing pages too - scan them so they turn into their real MP3 URL
+    to_resolve = [
+        mp3 for mp3 in all_mp3s
+        if mp3 not in scanned_pages and mp3 not in already_downloaded
+    ]
+    if to_resolve:
+        print(f"\n[4] Resolving {len(to_resolve)} MP3 link(s) that weren't crawled...")
+        resolved = 0
+        
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+            futures = {
+                executor.submit(scan_page, mp3, base_netloc, cache['pages']): mp3
+                for mp3 in to_resolve
+            }
             
-            mp3s_on_page = find_real_mp3_on_page(page_url, base_domain)
+            for future in as_completed(futures):
+                mp3 = futures[future]
+                real_mp3s, _ = future.result()
+                
+                # Same rule as step 3: only a successful scan that found other MP3s is a landing page
+                if real_mp3s and mp3 not in real_mp3s:
+                    del all_mp3s[mp3]
+                    for real_mp3 in real_mp3s - all_mp3s.keys():
+                        all_mp3s[real_mp3] = mp3
+                    resolved += 1
+        
+        if resolved:
+            print(f"    Replaced {resolved} landing page(s) with the MP3s they play")
+    
+    save_cache(output, cache)
+    
+    new_mp3s = {mp3: referer for mp3, referer in all_mp3s.items() if mp3 not in already_downloaded}
+    if len(new_mp3s) < len(all_mp3s):
+        print(f"\n    Skipping {len(all_mp3s) - len(new_mp3s)} MP3(s) already downloaded on an earlier run")
+    
+    # Step 5: Check every URL with a cheap HEAD request before downloading it
+    to_download = {}
+    if new_mp3s:
+        print(f"\n[5] Checking {len(new_mp3s)} MP3 URL(s)...")
+        
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            futures = {
+                executor.submit(preflight, mp3, referer): mp3
+                for mp3, referer in new_mp3s.items()
+            }
             
-            if mp3s_on_page:
-                print(f"        ✓ Found {len(mp3s_on_page)} MP3(s)")
-                for mp3 in mp3s_on_page:
-                    if mp3 not in all_mp3s:
-                        all_mp3s.add(mp3)
-                        if download_mp3(mp3, output, referer=page_url):
-                            downloaded_count += 1
-                        time.sleep(0.3)
-            else:
-                print(f"        No MP3s found on this page")
+            for future in as_completed(futures):
+                mp3 = futures[future]
+                worth_downloading, _ = future.result()
+                if worth_downloading:
+                    to_download[mp3] = new_mp3s[mp3]
+        
+        skipped = len(new_mp3s) - len(to_download)
+        if skipped:
+            print(f"    Skipping {skipped} dead, non-audio or tiny file(s)")
+    
+    # Step 6: Download everything that passed the check
+    if to_download:
+        print(f"\n[6] Downloading {len(to_download)} MP3(s)...")
+        
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            futures = {
+                executor.submit(download_mp3, mp3, output, referer, existing): mp3
+                for mp3, referer in to_download.items()
+            }
             
-            time.sleep(0.2)  # Be nice to the server
+            for future in as_completed(futures):
+                filename = future.result()
+                if filename:
+                    downloaded_count += 1
+                    cache['downloaded'][futures[future]] = filename
+        
+        save_cache(output, cache)
     
     print(f"\n{'='*70}")
     print("Search Complete!")